@@ -1,20 +1,29 @@
 # nim_cli.py
-import json
 import os
-from datetime import datetime, timedelta
+import sys
+import threading
+import time
+from functools import partial
+from types import MappingProxyType
 
 from nim_core import (
     load_previous_data,
     save_current_data,
-    compute_deltas_all,
     apply_deltas_to_snapshot,
     get_top_videos_by_metric,
     fetch_current_snapshot_from_youtube,
     build_snapshot_from_channels_and_keywords,
+    get_last_option5_run,
+    set_last_option5_run,
+    build_option5_limiter,
+    make_video_entry,
+    OPTION5_MIN_INTERVAL,
+    now_iso,
 )
 
-# Original tracked videos list (for assignment / option 1 & 4)
-TRACKED_VIDEOS = {
+# Original tracked videos list (for assignment / option 1 & 4).
+# Read-only: edit the literal below rather than mutating it at runtime.
+TRACKED_VIDEOS = MappingProxyType({
     "hasan_x8d6K399WW4": {
         "channel_name": "HasanAbi",
         "video_id": "x8d6K399WW4",
@@ -26,26 +35,112 @@ TRACKED_VIDEOS = {
         "label": "BoyBoy – I snuck into a major arms dealer conference"
     },
     # ... (rest of your fixed list – same as before)
-}
+})
 
-LAST_RUN_FILE = "last_option5_run.json"
+CLEAR_SCREEN = "\x1b[2J\x1b[H"  # ANSI: clear screen + cursor home
 
+# Background thread writing the last snapshot (see save_snapshot)
+_pending_save = None
 
-def get_last_option5_run():
-    if not os.path.exists(LAST_RUN_FILE):
-        return None
-    try:
-        with open(LAST_RUN_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return datetime.fromisoformat(data.get("last_run"))
-    except Exception:
-        return None
+# Exception raised by that thread, re-raised by wait_for_pending_save
+_pending_save_error = None
 
 
-def set_last_option5_run():
-    now = datetime.now().isoformat(timespec="seconds")
-    with open(LAST_RUN_FILE, "w", encoding="utf-8") as f:
-        json.dump({"last_run": now}, f, indent=2)
+def wait_for_pending_save():
+    """
+    Block until the background snapshot write (if any) has finished.
+    If the write failed, its exception is raised here.
+    """
+    global _pending_save, _pending_save_error
+    if _pending_save is not None:
+        _pending_save.join()
+        _pending_save = None
+
+    if _pending_save_error is not None:
+        err, _pending_save_error = _pending_save_error, None
+        raise err
+
+
+def load_snapshot_cached():
+    """
+    load_previous_data() once any background save has landed. The parsed
+    snapshot is memoized in nim_core, so going round the menu doesn't
+    re-parse a file that hasn't changed.
+    """
+    wait_for_pending_save()
+    return load_previous_data()
+
+
+def save_snapshot(snapshot, after_save=None):
+    """
+    save_current_data() in a background thread, so the write + fsync
+    overlaps with showing the grid and waiting for ENTER.
+    after_save(), if given, runs in that thread once the write succeeded.
+    The next load (or menu pass) waits for the write first and raises
+    anything it failed with.
+    The thread isn't a daemon, so exiting the CLI still lets it finish.
+    """
+    global _pending_save
+    wait_for_pending_save()
+
+    def write():
+        global _pending_save_error
+        try:
+            save_current_data(snapshot)
+            if after_save is not None:
+                after_save()
+        except Exception as e:
+            _pending_save_error = e
+
+    _pending_save = threading.Thread(target=write, name="snapshot-save")
+    _pending_save.start()
+
+
+def apply_deltas_and_save(previous_snapshot, current_snapshot, after_save=None):
+    """
+    Embed deltas (raw + %) into current_snapshot and save it.
+    after_save is passed on to save_snapshot.
+    """
+    current_snapshot = apply_deltas_to_snapshot(previous_snapshot, current_snapshot)
+    save_snapshot(current_snapshot, after_save=after_save)
+    return current_snapshot
+
+
+def prompt_int(prompt):
+    """
+    input() until the answer parses as an int.
+    """
+    while True:
+        raw = input(prompt).strip()
+        try:
+            return int(raw)
+        except ValueError:
+            print(f"    '{raw}' is not a whole number, please try again.")
+
+
+def prompt_video_stats():
+    """
+    Ask for (views, likes, comments, subscribers).
+    All four can be given on one line, e.g. pasted from a spreadsheet or
+    piped in from a script; a blank or malformed line falls back to one
+    prompt per number.
+    """
+    raw = input("  Stats (views likes comments subs, or blank for prompts): ")
+    parts = raw.split()
+    if parts:
+        try:
+            if len(parts) == 4:
+                return tuple(int(p) for p in parts)
+        except ValueError:
+            pass
+        print("    Expected 4 whole numbers, asking one at a time instead.")
+
+    return (
+        prompt_int("  Views: "),
+        prompt_int("  Likes: "),
+        prompt_int("  Comments: "),
+        prompt_int("  Subscribers: "),
+    )
 
 
 def fetch_current_data_for_all_videos_manual():
@@ -53,7 +148,7 @@ def fetch_current_data_for_all_videos_manual():
     Manual entry mode (option 1).
     """
     snapshot = {
-        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "timestamp": now_iso(),
         "videos": {}
     }
 
@@ -65,28 +160,53 @@ def fetch_current_data_for_all_videos_manual():
         print(f"Video ID: {meta['video_id']}")
         print(f"Label:    {meta.get('label', video_key)}")
 
-        views = int(input("  Views: ").strip())
-        likes = int(input("  Likes: ").strip())
-        comments = int(input("  Comments: ").strip())
-        subs = int(input("  Subscribers: ").strip())
-
-        snapshot["videos"][video_key] = {
-            "channel_name": meta["channel_name"],
-            "video_id": meta["video_id"],
-            "views": views,
-            "likes": likes,
-            "comments": comments,
-            "subscribers": subs,
-            "label": meta.get("label", video_key),
-        }
+        views, likes, comments, subs = prompt_video_stats()
+
+        snapshot["videos"][video_key] = make_video_entry(
+            meta["channel_name"],
+            meta["video_id"],
+            views,
+            likes,
+            comments,
+            meta.get("label", video_key),
+            subscribers=subs,
+        )
 
         print("")
 
     return snapshot
 
 
-def display_top_movers_grid(top_list, heading="TOP YOUTUBE MOVERS"):
-    print("\n" * 3)
+def clear_screen():
+    """
+    Clear the terminal with a single ANSI escape. Falls back to blank lines
+    when stdout isn't a terminal (piped output) or the console may not
+    understand ANSI (classic Windows console).
+    """
+    ansi_ok = os.name != "nt" or "WT_SESSION" in os.environ
+    if sys.stdout.isatty() and ansi_ok:
+        sys.stdout.write(CLEAR_SCREEN)
+    else:
+        sys.stdout.write("\n" * 4)
+
+
+def _pct_fmt(x):
+    if x is None:
+        return "N/A"
+    return f"{x:+.1f}%" if isinstance(x, (int, float)) else str(x)
+
+
+def _raw_fmt(x):
+    if x is None:
+        return "N/A"
+    return f"{x:,}" if isinstance(x, (int, float)) else str(x)
+
+
+def display_top_movers_grid(top_list, heading="TOP YOUTUBE MOVERS", metric_name="views_delta_pct"):
+    # Pick the number format once, not per cell
+    fmt = _pct_fmt if metric_name.endswith("_pct") else _raw_fmt
+
+    clear_screen()
     print("===========================================")
     print(f"        {heading}      ")
     print("===========================================\n")
@@ -96,21 +216,19 @@ def display_top_movers_grid(top_list, heading="TOP YOUTUBE MOVERS"):
         input("\nPress ENTER to return to menu...")
         return
 
+    # Build the whole grid first and write it in one go
+    lines = []
     row_size = 4
     for i in range(0, len(top_list), row_size):
         row = top_list[i:i + row_size]
 
         # First line: labels
-        for item in row:
-            label = item["label"][:20]
-            print(f"{label:<22}", end=" | ")
-        print("")
+        lines.append("".join(f"{item['label'][:20]:<22} | " for item in row))
 
         # Second line: deltas
-        for item in row:
-            delta = item["delta"]
-            print(f"Δ {delta:<18}", end=" | ")
-        print("\n")
+        lines.append("".join(f"Δ {fmt(item['delta']):<18} | " for item in row) + "\n")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
     input("\nPress ENTER to return to menu...")
 
@@ -119,6 +237,10 @@ def main_menu():
     running = True
 
     while running:
+        # Surface a failed background save (see save_snapshot) before
+        # anything else happens
+        wait_for_pending_save()
+
         print("\n===== YOUTUBE DASHBOARD (CLI) =====")
         print("1. Capture ALL tracked videos manually + show top movers")
         print("2. View last snapshot only")
@@ -128,11 +250,9 @@ def main_menu():
         choice = input("Select an option: ").strip()
 
         if choice == "1":
-            previous_snapshot = load_previous_data()
+            previous_snapshot = load_snapshot_cached()
             current_snapshot = fetch_current_data_for_all_videos_manual()
-            # embed deltas (raw + %)
-            current_snapshot = apply_deltas_to_snapshot(previous_snapshot, current_snapshot)
-            save_current_data(current_snapshot)
+            current_snapshot = apply_deltas_and_save(previous_snapshot, current_snapshot)
 
             top_list = get_top_videos_by_metric(
                 current_snapshot, metric="views_delta_pct", top_n=16
@@ -140,27 +260,28 @@ def main_menu():
             display_top_movers_grid(top_list, heading="TOP MOVERS (Manual)")
 
         elif choice == "2":
-            snapshot = load_previous_data()
+            snapshot = load_snapshot_cached()
             if snapshot is None:
                 print("No saved data found.")
                 input("Press ENTER to return to menu...")
             else:
-                # If snapshot already has deltas, use them; otherwise fall back to views.
-                metric = "views_delta_pct" if any(
-                    "views_delta_pct" in v for v in snapshot.get("videos", {}).values()
-                ) else "views"
+                # Rank by deltas if the snapshot has any usable ones; otherwise
+                # (e.g. first snapshot, no previous values) fall back to total views.
+                metric = "views_delta_pct"
                 top_list = get_top_videos_by_metric(snapshot, metric=metric, top_n=16)
-                display_top_movers_grid(top_list, heading="LAST SNAPSHOT")
+                if not top_list:
+                    metric = "views"
+                    top_list = get_top_videos_by_metric(snapshot, metric=metric, top_n=16)
+                display_top_movers_grid(top_list, heading="LAST SNAPSHOT", metric_name=metric)
 
         elif choice == "3":
             running = False
 
         elif choice == "4":
             print("Fetching stats from YouTube API for fixed TRACKED_VIDEOS...")
-            previous_snapshot = load_previous_data()
+            previous_snapshot = load_snapshot_cached()
             current_snapshot = fetch_current_snapshot_from_youtube(TRACKED_VIDEOS)
-            current_snapshot = apply_deltas_to_snapshot(previous_snapshot, current_snapshot)
-            save_current_data(current_snapshot)
+            current_snapshot = apply_deltas_and_save(previous_snapshot, current_snapshot)
 
             top_list = get_top_videos_by_metric(
                 current_snapshot, metric="views_delta_pct", top_n=16
@@ -169,17 +290,17 @@ def main_menu():
 
         elif choice == "5":
             last_run = get_last_option5_run()
-            if last_run is not None:
-                elapsed = datetime.now() - last_run
-                if elapsed < timedelta(minutes=1):
-                    print("\n[INFO] Option 5 was already run within the last 1 minute.")
-                    print("      Skipping to avoid burning YouTube API quota.")
-                    input("\nPress ENTER to return to menu...")
-                    continue
+            if last_run is not None and time.time() - last_run < OPTION5_MIN_INTERVAL:
+                print("\n[INFO] Option 5 was already run within the last 1 minute.")
+                print("      Skipping to avoid burning YouTube API quota.")
+                input("\nPress ENTER to return to menu...")
+                continue
 
+            limiter = build_option5_limiter()
             current_snapshot = build_snapshot_from_channels_and_keywords(
                 max_per_channel=5,
                 max_per_keyword=3,
+                limiter=limiter,
             )
 
             if not current_snapshot.get("videos"):
@@ -188,10 +309,13 @@ def main_menu():
                 input("\nPress ENTER to return to menu...")
                 continue
 
-            previous_snapshot = load_previous_data()
-            current_snapshot = apply_deltas_to_snapshot(previous_snapshot, current_snapshot)
-            save_current_data(current_snapshot)
-            set_last_option5_run()
+            previous_snapshot = load_snapshot_cached()
+            # Only count the run once its snapshot is actually on disk
+            current_snapshot = apply_deltas_and_save(
+                previous_snapshot,
+                current_snapshot,
+                after_save=partial(set_last_option5_run, quota_remaining=limiter.tokens),
+            )
 
             top_list = get_top_videos_by_metric(
                 current_snapshot, metric="views_delta_pct", top_n=16
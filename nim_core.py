@@ -1,21 +1,75 @@
 # nim_core.py
+import gzip
+import heapq
 import json
 import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import cache, partial
+from operator import itemgetter
 
-import requests
-from requests.exceptions import HTTPError
+try:
+    import orjson
+except ImportError:  # optional speed-up, fall back to the stdlib json module
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional, only used to stream very large snapshots
+    ijson = None
 
 from config import YOUTUBE_API_KEY
 
-DATA_FILE_PATH = "youtube_metrics.json"
+# Snapshot location; a path ending in ".gz" stores it gzip-compressed
+DATA_FILE_PATH = os.getenv("NIM_DATA_FILE", "youtube_metrics.json")
+LAST_RUN_FILE = "last_option5_run.json"
+OPTION5_MIN_INTERVAL = 60  # seconds between option-5 / refresh runs
 CHANNELS_CONFIG_PATH = "channels.json"
 KEYWORDS_CONFIG_PATH = "keywords.json"
+STREAM_PARSE_MIN_BYTES = 10 * 1024 * 1024  # stream snapshots bigger than this
+VIDEO_CACHE_PATH = "video_cache.json"
+VIDEO_CACHE_MAX_AGE = 7 * 24 * 3600  # seconds before a cached entry is dropped
+UPLOADS_PLAYLIST_CACHE_PATH = "uploads_playlist_cache.json"
+CHANNEL_ID_LENGTH = 24  # "UC" + 22 base64url characters
 MIN_VIEWS_FOR_DISPLAY = 25000  # only show videos with at least this many views
+VIDEOS_PER_REQUEST = 50  # videos.list accepts at most 50 IDs per call
+# Only ask videos.list for what _fetch_stats_batch reads (etag is for the cache)
+VIDEOS_LIST_FIELDS = (
+    "etag,items(id,snippet(title,channelTitle),"
+    "statistics(viewCount,likeCount,commentCount))"
+)
+MAX_CONCURRENT_REQUESTS = 8  # cap on parallel YouTube API calls
+YOUTUBE_DAILY_QUOTA = 10000  # default Data API v3 quota units per day
+SEARCH_LIST_COST = 100  # search.list costs 100 units, the other list calls 1
+QUOTA_REFILL_PER_SEC = YOUTUBE_DAILY_QUOTA / 86400  # quota resets daily
+SNAPSHOT_TTL_SECONDS = 60  # a snapshot younger than this may be reused...
+SNAPSHOT_DELTA_THRESHOLD = 0.001  # ...if sampled stats moved less than this
+SNAPSHOT_SAMPLE_SIZE = 3  # videos re-fetched to decide whether to reuse
 
 
 # ---------- CONFIG LOADERS ----------
 
+def _parse_json_list(path):
+    try:
+        data = read_json(path)
+    except json.JSONDecodeError:
+        return []
+
+    return data if isinstance(data, list) else []
+
+
+def _load_json_list(path):
+    """
+    Parse a JSON config file that should hold a list.
+    Returns [] if the file is missing, malformed or not a list.
+    """
+    return load_json_cached(path, _parse_json_list, default=[])
+
+
 def load_channels_config():
     """
     Load list of channels from channels.json.
@@ -25,18 +79,7 @@ def load_channels_config():
       ...
     ]
     """
-    if not os.path.exists(CHANNELS_CONFIG_PATH):
-        return []
-
-    try:
-        with open(CHANNELS_CONFIG_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                return data
-    except json.JSONDecodeError:
-        pass
-
-    return []
+    return _load_json_list(CHANNELS_CONFIG_PATH)
 
 
 def load_keywords_config():
@@ -52,51 +95,292 @@ def load_keywords_config():
       ...
     ]
     """
-    if not os.path.exists(KEYWORDS_CONFIG_PATH):
-        return []
+    return _load_json_list(KEYWORDS_CONFIG_PATH)
+
+
+# ---------- FILE I/O ----------
 
+def _json_loads(raw):
+    """
+    Parse JSON from bytes (with orjson when it's installed).
+    Raises json.JSONDecodeError on malformed content.
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def read_json(path):
+    """
+    Parse a JSON file (with orjson when it's installed).
+    Paths ending in ".gz" are gunzipped first.
+    Raises json.JSONDecodeError on malformed content.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+
+    if path.endswith(".gz"):
+        try:
+            raw = gzip.decompress(raw)
+        except (OSError, EOFError) as e:
+            raise json.JSONDecodeError(f"bad gzip data: {e}", "", 0)
+
+    return _json_loads(raw)
+
+
+def write_json(path, obj, sort_keys=False):
+    """
+    Write obj to path as indented JSON (with orjson when it's installed).
+    Paths ending in ".gz" get compact, gzip-compressed JSON instead.
+
+    The data goes to a fresh temp file next to path first, is fsync'd,
+    then renamed over path, so a crash mid-write never leaves a truncated
+    file behind, and two processes saving at once don't share a temp file.
+    """
+    compress = path.endswith(".gz")
+
+    if orjson is not None:
+        option = 0 if compress else orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        payload = orjson.dumps(obj, option=option)
+    else:
+        indent = None if compress else 2
+        payload = json.dumps(obj, indent=indent, sort_keys=sort_keys).encode("utf-8")
+
+    if compress:
+        payload = gzip.compress(payload, compresslevel=6)
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".",
+        prefix=os.path.basename(path) + ".",
+        suffix=".tmp",
+    )
     try:
-        with open(KEYWORDS_CONFIG_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                return data
-    except json.JSONDecodeError:
-        pass
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)  # mkstemp creates it owner-only
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
 
-    return []
+    with _FILE_CACHE_LOCK:
+        _FILE_CACHE.pop(path, None)
 
 
-# ---------- FILE I/O ----------
+# Parsed files, path -> (file_stamp, data); see load_json_cached
+_FILE_CACHE = {}
+_FILE_CACHE_LOCK = threading.Lock()
 
-def load_previous_data():
+
+def file_stamp(path):
     """
-    Load the last saved snapshot from youtube_metrics.json.
-    Returns a dict or None.
+    (st_mtime_ns, st_size) of path, or None if it doesn't exist.
+    Changes whenever the file is rewritten, so it versions anything
+    derived from the file.
     """
-    if not os.path.exists(DATA_FILE_PATH):
+    try:
+        st = os.stat(path)
+    except OSError:
         return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def load_json_cached(path, parse, default=None):
+    """
+    parse(path), memoized on the file's mtime and size, so the snapshot
+    and configs are only re-parsed after they change on disk (every web
+    request and CLI menu pass reads them). Returns default if the file
+    doesn't exist.
+
+    The same object is handed to every caller: don't mutate it.
+    """
+    stamp = file_stamp(path)
+    if stamp is None:
+        return default
+
+    with _FILE_CACHE_LOCK:
+        hit = _FILE_CACHE.get(path)
+        if hit is not None and hit[0] == stamp:
+            return hit[1]
+
+        data = parse(path)
+        _FILE_CACHE[path] = (stamp, data)
+        return data
+
+
+def _stream_snapshot(path):
+    """
+    Parse a snapshot file with ijson, one video entry at a time, so the
+    raw bytes and the full document are never both in memory.
+    Only "timestamp" and "videos" are kept.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        timestamp = next(ijson.items(f, "timestamp"), None)
+        f.seek(0)
+        videos = dict(ijson.kvitems(f, "videos", use_float=True))
+
+    return {"timestamp": timestamp, "videos": videos}
+
+
+def _parse_snapshot(path):
+    if ijson is not None and os.path.getsize(path) > STREAM_PARSE_MIN_BYTES:
+        try:
+            return _stream_snapshot(path)
+        except (ijson.JSONError, OSError, EOFError):  # incl. bad gzip data
+            return None
 
     try:
-        with open(DATA_FILE_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if isinstance(data, dict):
-                return data
-    except json.JSONDecodeError:
+        data = read_json(path)
+    except json.JSONDecodeError:  # also covers orjson.JSONDecodeError
         return None
 
-    return None
+    return data if isinstance(data, dict) else None
+
+
+def load_previous_data():
+    """
+    Load the last saved snapshot from youtube_metrics.json.
+    Returns a dict or None.
+
+    Files over STREAM_PARSE_MIN_BYTES are stream-parsed when ijson is
+    installed. The result is memoized (see load_json_cached), so treat it
+    as read-only.
+    """
+    return load_json_cached(DATA_FILE_PATH, _parse_snapshot)
 
 
 def save_current_data(current_snapshot):
     """
     Save the current snapshot to youtube_metrics.json.
     """
-    with open(DATA_FILE_PATH, "w", encoding="utf-8") as f:
-        json.dump(current_snapshot, f, indent=2)
+    write_json(DATA_FILE_PATH, current_snapshot, sort_keys=True)
+
+
+def load_video_cache():
+    """
+    Load the videos.list ETag cache from video_cache.json, dropping videos
+    fetched more than VIDEO_CACHE_MAX_AGE ago (and batches that use them).
+    Format:
+    {
+      "batches": {"id1,id2,...": {"etag": etag, "ids": [ids returned]}},
+      "videos": {video_id: {"stats": {...}, "fetched_at": epoch}}
+    }
+    "ids" lists only the videos the API actually returned for that ETag;
+    a requested ID it left out (deleted, private) isn't part of the batch.
+    Batches in the older {key: etag} format are dropped.
+    """
+    cache = {"batches": {}, "videos": {}}
+    if not os.path.exists(VIDEO_CACHE_PATH):
+        return cache
+
+    try:
+        data = read_json(VIDEO_CACHE_PATH)
+    except json.JSONDecodeError:
+        return cache
+
+    if not isinstance(data, dict):
+        return cache
+
+    cutoff = time.time() - VIDEO_CACHE_MAX_AGE
+    for vid, entry in data.get("videos", {}).items():
+        if entry.get("fetched_at", 0) >= cutoff:
+            cache["videos"][vid] = entry
+    for key, entry in data.get("batches", {}).items():
+        if not isinstance(entry, dict) or not isinstance(entry.get("ids"), list):
+            continue
+        if all(vid in cache["videos"] for vid in entry["ids"]):
+            cache["batches"][key] = entry
+
+    return cache
+
+
+def save_video_cache(cache):
+    """
+    Save the per-video ETag cache to video_cache.json.
+    """
+    write_json(VIDEO_CACHE_PATH, cache)
+
+
+def load_uploads_playlist_cache():
+    """
+    Load the channel_id -> uploads playlist ID map from
+    uploads_playlist_cache.json. Returns {} if missing or malformed.
+    """
+    if not os.path.exists(UPLOADS_PLAYLIST_CACHE_PATH):
+        return {}
+
+    try:
+        data = read_json(UPLOADS_PLAYLIST_CACHE_PATH)
+    except json.JSONDecodeError:
+        return {}
+
+    return data if isinstance(data, dict) else {}
+
+
+def save_uploads_playlist_cache(cache):
+    """
+    Save the channel_id -> uploads playlist ID map.
+    """
+    write_json(UPLOADS_PLAYLIST_CACHE_PATH, cache, sort_keys=True)
 
 
 # ---------- DELTAS & RANKING ----------
 
+def _na_delta_row():
+    return {
+        "views_delta": None,
+        "likes_delta": None,
+        "comments_delta": None,
+        "subscribers_delta": None,
+        "views_delta_pct": None,
+    }
+
+
+def _views_delta_pct(prev_views, views_delta):
+    if prev_views > 0:
+        return round((views_delta / prev_views) * 100.0, 2)
+    return None
+
+
+def _delta_row(prev_metrics, curr_metrics):
+    """
+    Delta row for a video present in both snapshots. A counter missing
+    from either side (e.g. a hand-edited snapshot) gives None for that
+    field instead of a KeyError.
+    """
+    pv = prev_metrics.get("views")
+    cv = curr_metrics.get("views")
+    if pv is not None and cv is not None:
+        views_delta = cv - pv
+        views_delta_pct = _views_delta_pct(pv, views_delta)
+    else:
+        views_delta = views_delta_pct = None
+
+    pl = prev_metrics.get("likes")
+    cl = curr_metrics.get("likes")
+    pc = prev_metrics.get("comments")
+    cc = curr_metrics.get("comments")
+
+    return {
+        "views_delta": views_delta,
+        "likes_delta": (cl - pl) if (pl is not None and cl is not None) else None,
+        "comments_delta": (cc - pc) if (pc is not None and cc is not None) else None,
+        "subscribers_delta": (
+            curr_metrics.get("subscribers", 0) -
+            prev_metrics.get("subscribers", 0)
+        ),
+        "views_delta_pct": views_delta_pct,
+    }
+
+
 def compute_deltas_all(previous_snapshot, current_snapshot):
     """
     Compute raw deltas between previous and current snapshot.
@@ -104,47 +388,30 @@ def compute_deltas_all(previous_snapshot, current_snapshot):
     {
       "videos": {
         video_key: {
-          "views_delta": int | "N/A",
+          "views_delta": int | None,
           "likes_delta": ...,
           "comments_delta": ...,
           "subscribers_delta": ...,
+          "views_delta_pct": float | None,
         }
       }
     }
+    None (saved as null) means there's no previous value to compare to.
     """
     deltas = {"videos": {}}
 
     if previous_snapshot is None or "videos" not in previous_snapshot:
         for video_key in current_snapshot.get("videos", {}):
-            deltas["videos"][video_key] = {
-                "views_delta": "N/A",
-                "likes_delta": "N/A",
-                "comments_delta": "N/A",
-                "subscribers_delta": "N/A",
-            }
+            deltas["videos"][video_key] = _na_delta_row()
         return deltas
 
     prev_videos = previous_snapshot.get("videos", {})
 
     for video_key, curr_metrics in current_snapshot.get("videos", {}).items():
         if video_key in prev_videos:
-            prev_metrics = prev_videos[video_key]
-            deltas["videos"][video_key] = {
-                "views_delta": curr_metrics["views"] - prev_metrics["views"],
-                "likes_delta": curr_metrics["likes"] - prev_metrics["likes"],
-                "comments_delta": curr_metrics["comments"] - prev_metrics["comments"],
-                "subscribers_delta": (
-                    curr_metrics.get("subscribers", 0) -
-                    prev_metrics.get("subscribers", 0)
-                ),
-            }
+            deltas["videos"][video_key] = _delta_row(prev_videos[video_key], curr_metrics)
         else:
-            deltas["videos"][video_key] = {
-                "views_delta": "N/A",
-                "likes_delta": "N/A",
-                "comments_delta": "N/A",
-                "subscribers_delta": "N/A",
-            }
+            deltas["videos"][video_key] = _na_delta_row()
 
     return deltas
 
@@ -167,23 +434,8 @@ def apply_deltas_to_snapshot(previous_snapshot, current_snapshot):
         if cur is None:
             continue
 
-        # Copy raw deltas into snapshot
-        for k, v in delta_vals.items():
-            cur[k] = v
-
-        # Compute % delta for views, if possible
-        views_delta = delta_vals.get("views_delta")
-        if isinstance(views_delta, int):
-            # Approx previous views
-            prev_views = cur["views"] - views_delta
-            if prev_views > 0:
-                pct = round((views_delta / prev_views) * 100.0, 2)
-            else:
-                pct = "N/A"
-        else:
-            pct = "N/A"
-
-        cur["views_delta_pct"] = pct
+        # Copy deltas (raw + %) into snapshot
+        cur.update(delta_vals)
 
     return current_snapshot
 
@@ -200,7 +452,7 @@ def get_top_videos_by_metric(snapshot, metric="views_delta_pct", top_n=16):
     Applies a global minimum view threshold (MIN_VIEWS_FOR_DISPLAY), so
     only videos with at least that many total views are considered.
     """
-    rows = []
+    candidates = []
     videos = snapshot.get("videos", {})
 
     for video_key, metrics in videos.items():
@@ -210,43 +462,259 @@ def get_top_videos_by_metric(snapshot, metric="views_delta_pct", top_n=16):
         if not isinstance(views, int) or views < MIN_VIEWS_FOR_DISPLAY:
             continue
 
-        label = metrics.get("label", video_key)
-        channel_name = metrics.get("channel_name", "")
-        video_id = metrics.get("video_id", "")
-
         # Decide what we use as sort value
         if metric == "views":
             sort_value = views
-            delta_display = sort_value
         else:
-            sort_value = metrics.get(metric, "N/A")
-            if isinstance(sort_value, str):
-                # skip items without a real numeric delta (e.g. first snapshot)
+            sort_value = metrics.get(metric)
+            if sort_value is None or sort_value == "N/A":
+                # skip items without a real numeric delta (e.g. first
+                # snapshot); "N/A" is how older snapshots stored it
                 continue
-            delta_display = sort_value
 
-        rows.append({
+        candidates.append((sort_value, video_key, metrics))
+
+    # Top N by chosen metric, descending (O(N log top_n), no full sort);
+    # row dicts are only built for the winners
+    top = heapq.nlargest(top_n, candidates, key=itemgetter(0))
+
+    return [
+        {
             "video_key": video_key,
-            "channel_name": channel_name,
-            "video_id": video_id,
-            "label": label,
-            "current_value": views,
-            "delta": delta_display,
-        })
+            "channel_name": metrics.get("channel_name", ""),
+            "video_id": metrics.get("video_id", ""),
+            "label": metrics.get("label", video_key),
+            "current_value": metrics.get("views", 0),
+            "delta": sort_value,
+        }
+        for sort_value, video_key, metrics in top
+    ]
 
-    # Sort by chosen metric descending
-    rows.sort(key=lambda r: r["delta"], reverse=True)
 
-    # Take top N
-    return rows[:top_n]
+# ---------- QUOTA THROTTLING ----------
 
+class RateLimiter:
+    """
+    Token bucket used to pace YouTube API calls against the quota.
+    Tokens refill continuously at rate_per_sec, up to burst.
+
+    acquire(cost) blocks until enough tokens are available, but gives up
+    (returns False) once it can't get them within max_wait seconds of being
+    called, so we skip a call instead of letting it fail with a 403.
+    Safe to share between threads.
+    """
+
+    def __init__(self, rate_per_sec, burst, tokens=None, max_wait=30.0):
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        self.tokens = burst if tokens is None else max(0.0, min(tokens, burst))
+        self.max_wait = max_wait
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate_per_sec)
+        self._last_refill = now
+
+    def acquire(self, cost=1):
+        if cost > self.burst:
+            return False
+
+        # One deadline for the whole call: other threads can take the
+        # refilled tokens while we sleep, so waits must not add up
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= cost:
+                    self.tokens -= cost
+                    return True
+                wait = (cost - self.tokens) / self.rate_per_sec
+
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+def _acquire_quota(limiter, cost, what):
+    """
+    Take `cost` units from limiter (if one is given).
+    Prints a warning and returns False when the budget can't cover the call.
+    """
+    if limiter is None or limiter.acquire(cost):
+        return True
+
+    print(f"[WARN] Quota budget exhausted, skipping {what}")
+    return False
+
+
+# ---------- OPTION 5 RUN STATE ----------
+# Shared by the CLI (option 5) and the web /refresh route.
+
+def load_last_option5_state():
+    if not os.path.exists(LAST_RUN_FILE):
+        return {}
+    try:
+        data = read_json(LAST_RUN_FILE)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def get_last_option5_run():
+    """
+    Unix time (int seconds) of the last option-5 / refresh run, or None.
+    Also reads the older ISO "last_run" string format.
+    """
+    state = load_last_option5_state()
+    epoch = state.get("last_run_epoch")
+    if isinstance(epoch, int):
+        return epoch
+
+    try:
+        return int(datetime.fromisoformat(state.get("last_run")).timestamp())
+    except Exception:
+        return None
+
+
+def set_last_option5_run(quota_remaining=None):
+    state = {"last_run_epoch": int(time.time())}
+    if quota_remaining is not None:
+        state["quota_remaining"] = round(quota_remaining)
+    write_json(LAST_RUN_FILE, state)
+
+
+def build_option5_limiter():
+    """
+    Token bucket for option 5, resumed from the quota estimate saved by the
+    previous run and refilled for the time elapsed since then.
+    """
+    tokens = None
+    saved = load_last_option5_state().get("quota_remaining")
+    last_run = get_last_option5_run()
+    if isinstance(saved, (int, float)) and last_run is not None:
+        elapsed = time.time() - last_run
+        tokens = saved + max(0.0, elapsed) * QUOTA_REFILL_PER_SEC
+
+    return RateLimiter(QUOTA_REFILL_PER_SEC, YOUTUBE_DAILY_QUOTA, tokens=tokens)
 
 
 # ---------- YOUTUBE API HELPERS ----------
 
-def fetch_youtube_stats_for_videos(api_key, video_ids):
+@cache
+def _requests():
+    """
+    The requests module, imported on first use. It is most of this
+    module's import time, and the view-only paths (CLI option 2, the web
+    dashboard) never make an HTTP call.
+    """
+    import requests
+    return requests
+
+
+@cache
+def _session():
+    """
+    Shared requests.Session for every YouTube API call. It keeps the
+    connections to googleapis.com alive between calls (no new TCP + TLS
+    handshake per request), retries 429/5xx responses with backoff and
+    asks for gzip-compressed responses.
+    """
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False,  # hand the last response to raise_for_status()
+    )
+    adapter = HTTPAdapter(
+        pool_connections=MAX_CONCURRENT_REQUESTS,
+        pool_maxsize=MAX_CONCURRENT_REQUESTS,
+        max_retries=retry,
+    )
+
+    session = _requests().Session()
+    session.mount("https://", adapter)
+    # Google APIs only gzip responses for clients whose User-Agent says "gzip"
+    session.headers.update({
+        "Accept-Encoding": "gzip",
+        "User-Agent": "nim-dashboard/1.0 (gzip)",
+    })
+    return session
+
+
+def _fetch_stats_batch(api_key, batch_ids, etag=None, limiter=None):
+    """
+    Fetch snippet + statistics for one batch (up to 50) of video IDs with a
+    single videos.list call. batch_ids is the comma-joined ID string.
+
+    If etag is given it is sent as If-None-Match.
+    Returns (stats_by_id, response_etag, not_modified); stats_by_id is {}
+    on API error or when the server answered 304 Not Modified.
+    """
+    if not _acquire_quota(limiter, 1, "stats batch"):
+        return {}, None, False
+
+    base_url = "https://www.googleapis.com/youtube/v3/videos"
+    params = {
+        "part": "snippet,statistics",
+        "fields": VIDEOS_LIST_FIELDS,
+        "id": batch_ids,
+        "key": api_key,
+    }
+
+    headers = {"If-None-Match": etag} if etag else None
+
+    requests = _requests()
+    try:
+        resp = _session().get(base_url, params=params, headers=headers, timeout=10)
+        resp.raise_for_status()
+    except requests.exceptions.HTTPError as e:
+        print("\n====================== API ERROR ======================")
+        print(f"Error fetching stats batch: {e}")
+        try:
+            print("YouTube response snippet:")
+            print(resp.text[:500])
+        except Exception:
+            pass
+        print("Skipping this batch, keeping results from the others...")
+        print("=======================================================\n")
+        return {}, None, False
+
+    if resp.status_code == 304:
+        return {}, etag, True
+
+    stats_by_id = {}
+    data = _json_loads(resp.content)
+    for item in data.get("items", []):
+        vid = item["id"]
+        snippet = item.get("snippet", {})
+        stats = item.get("statistics", {})
+
+        stats_by_id[vid] = {
+            "title": snippet.get("title", ""),
+            "channel_title": snippet.get("channelTitle", ""),
+            "views": int(stats.get("viewCount", 0)),
+            "likes": int(stats.get("likeCount", 0)) if "likeCount" in stats else 0,
+            "comments": int(stats.get("commentCount", 0)) if "commentCount" in stats else 0,
+        }
+
+    return stats_by_id, data.get("etag"), False
+
+
+def fetch_youtube_stats_for_videos(api_key, video_ids, limiter=None, use_cache=False):
     """
     Call the YouTube Data API to get stats for a list of video IDs.
+    IDs are sent 50 per videos.list call, and the batches are issued
+    concurrently (at most MAX_CONCURRENT_REQUESTS in flight).
+
+    With use_cache=True, each batch is sent with the ETag from the last
+    time it was fetched (see video_cache.json); batches the server reports
+    as unchanged (304) are served from the cached stats.
     Returns:
     {
       "video_id": {
@@ -262,86 +730,189 @@ def fetch_youtube_stats_for_videos(api_key, video_ids):
     if not api_key:
         raise RuntimeError("No API key found in config.py")
 
+    if not video_ids:
+        return {}
+
+    # Most calls (e.g. the fixed tracked list) fit in a single batch
+    if len(video_ids) <= VIDEOS_PER_REQUEST:
+        batches = [video_ids]
+    else:
+        batches = [
+            video_ids[i:i + VIDEOS_PER_REQUEST]
+            for i in range(0, len(video_ids), VIDEOS_PER_REQUEST)
+        ]
+    # Joined once: it's both the request's id= value and the ETag cache key
+    batch_keys = [",".join(batch) for batch in batches]
+
+    cache = load_video_cache() if use_cache else None
+
+    cached_batches = [
+        cache["batches"].get(key) if cache is not None else None
+        for key in batch_keys
+    ]
+    etags = [entry["etag"] if entry else None for entry in cached_batches]
+
+    fetch = partial(_fetch_stats_batch, api_key, limiter=limiter)
     stats_by_id = {}
-    base_url = "https://www.googleapis.com/youtube/v3/videos"
+    if len(batches) == 1:
+        results = [fetch(batch_keys[0], etags[0])]
+    else:
+        workers = min(MAX_CONCURRENT_REQUESTS, len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            results = list(ex.map(fetch, batch_keys, etags))
+
+    now = int(time.time())
+    for key, cached, (batch_stats, etag, not_modified) in zip(batch_keys, cached_batches, results):
+        if not_modified:
+            # Same response as when the ETag was issued: only the videos
+            # it contained, not every ID that was asked for
+            for vid in cached["ids"]:
+                stats_by_id[vid] = cache["videos"][vid]["stats"]
+            continue
+
+        stats_by_id.update(batch_stats)
+
+        if cache is not None and batch_stats:
+            cache["batches"][key] = {"etag": etag, "ids": list(batch_stats)}
+            for vid, stats in batch_stats.items():
+                cache["videos"][vid] = {
+                    "stats": stats,
+                    "fetched_at": now,
+                }
+
+    if cache is not None:
+        save_video_cache(cache)
+
+    return stats_by_id
+
+
+# In-memory copy of uploads_playlist_cache.json, loaded on first use
+_UPLOADS_CACHE = None
+_UPLOADS_CACHE_LOCK = threading.Lock()
+
+
+def _cached_uploads_playlist_id(channel_id):
+    """
+    Uploads playlist ID for channel_id without an API call, or None.
+    Checks the cache first, then derives it from a standard channel ID
+    ("UC" + 22 characters; the uploads playlist is the same ID with a
+    "UU" prefix). Anything else needs a channels.list lookup.
+    """
+    global _UPLOADS_CACHE
+    with _UPLOADS_CACHE_LOCK:
+        if _UPLOADS_CACHE is None:
+            _UPLOADS_CACHE = load_uploads_playlist_cache()
+        playlist_id = _UPLOADS_CACHE.get(channel_id)
+
+    if playlist_id:
+        return playlist_id
+    if len(channel_id) == CHANNEL_ID_LENGTH and channel_id.startswith("UC"):
+        return "UU" + channel_id[2:]
+    return None
+
 
-    for i in range(0, len(video_ids), 50):
-        batch = video_ids[i:i + 50]
-        params = {
-            "part": "snippet,statistics",
+def _remember_uploads_playlist_ids(playlist_ids):
+    """
+    Add resolved {channel_id: uploads playlist ID} pairs to the cache and
+    persist it.
+    """
+    global _UPLOADS_CACHE
+    with _UPLOADS_CACHE_LOCK:
+        if _UPLOADS_CACHE is None:
+            _UPLOADS_CACHE = load_uploads_playlist_cache()
+        _UPLOADS_CACHE.update(playlist_ids)
+        save_uploads_playlist_cache(_UPLOADS_CACHE)
+
+
+def fetch_uploads_playlist_ids(api_key, channel_ids, limiter=None):
+    """
+    Resolve the 'uploads' playlist of each channel.
+    Returns {channel_id: uploads_playlist_id}; channels that don't exist
+    (or whose batch failed) are left out.
+
+    Cached or derivable IDs cost nothing; the rest are looked up with
+    channels.list, up to 50 channels per call, and then cached.
+    """
+    if not api_key:
+        raise RuntimeError("No API key found in config.py")
+
+    playlist_ids = {}
+    missing = []
+    for channel_id in dict.fromkeys(channel_ids):
+        cached = _cached_uploads_playlist_id(channel_id)
+        if cached is None:
+            missing.append(channel_id)
+        else:
+            playlist_ids[channel_id] = cached
+
+    channels_url = "https://www.googleapis.com/youtube/v3/channels"
+    requests = _requests()
+    resolved = {}
+
+    for i in range(0, len(missing), VIDEOS_PER_REQUEST):
+        batch = missing[i:i + VIDEOS_PER_REQUEST]
+        if not _acquire_quota(limiter, 1, f"{len(batch)} channel(s)"):
+            break
+
+        chan_params = {
+            "part": "contentDetails",
+            "fields": "items(id,contentDetails/relatedPlaylists/uploads)",
             "id": ",".join(batch),
             "key": api_key,
         }
-
         try:
-            resp = requests.get(base_url, params=params, timeout=10)
+            resp = _session().get(channels_url, params=chan_params, timeout=10)
             resp.raise_for_status()
-        except HTTPError as e:
+        except requests.exceptions.HTTPError as e:
             print("\n====================== API ERROR ======================")
-            print(f"Error fetching stats batch: {e}")
+            print(f"Error resolving uploads playlists: {e}")
             try:
                 print("YouTube response snippet:")
                 print(resp.text[:500])
             except Exception:
                 pass
-            print("Returning partial results so far...")
+            print("Skipping these channels...")
             print("=======================================================\n")
-            return stats_by_id
+            continue
 
-        data = resp.json()
+        data = _json_loads(resp.content)
         for item in data.get("items", []):
-            vid = item["id"]
-            snippet = item.get("snippet", {})
-            stats = item.get("statistics", {})
-
-            stats_by_id[vid] = {
-                "title": snippet.get("title", ""),
-                "channel_title": snippet.get("channelTitle", ""),
-                "views": int(stats.get("viewCount", 0)),
-                "likes": int(stats.get("likeCount", 0)) if "likeCount" in stats else 0,
-                "comments": int(stats.get("commentCount", 0)) if "commentCount" in stats else 0,
-            }
+            resolved[item["id"]] = item["contentDetails"]["relatedPlaylists"]["uploads"]
 
-    return stats_by_id
+        for channel_id in batch:
+            if channel_id not in resolved:
+                print(f"[WARN] No channel found for id {channel_id}")
+
+    if resolved:
+        _remember_uploads_playlist_ids(resolved)
+        playlist_ids.update(resolved)
+
+    return playlist_ids
 
 
-def fetch_latest_video_ids_for_channel_via_playlist(api_key, channel_id, max_results=5):
+def fetch_latest_video_ids_for_playlist(
+    api_key, playlist_id, max_results=5, limiter=None
+):
     """
-    Get latest uploads for a channel via its 'uploads' playlist.
-    Much cheaper than search.list in quota terms.
+    Get the most recent video IDs from a playlist (1 quota unit).
     """
     if not api_key:
         raise RuntimeError("No API key found in config.py")
 
-    # 1) Get uploads playlist
-    channels_url = "https://www.googleapis.com/youtube/v3/channels"
-    chan_params = {
-        "part": "contentDetails",
-        "id": channel_id,
-        "key": api_key,
-    }
-    resp = requests.get(channels_url, params=chan_params, timeout=10)
-    resp.raise_for_status()
-    data = resp.json()
-
-    items = data.get("items", [])
-    if not items:
-        print(f"[WARN] No channel found for id {channel_id}")
+    if not _acquire_quota(limiter, 1, f"playlist {playlist_id}"):
         return []
 
-    uploads_playlist_id = items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
-
-    # 2) Fetch recent items from uploads playlist
     playlist_items_url = "https://www.googleapis.com/youtube/v3/playlistItems"
     pl_params = {
         "part": "contentDetails",
-        "playlistId": uploads_playlist_id,
+        "fields": "items(contentDetails/videoId)",
+        "playlistId": playlist_id,
         "maxResults": max_results,
         "key": api_key,
     }
-    resp = requests.get(playlist_items_url, params=pl_params, timeout=10)
+    resp = _session().get(playlist_items_url, params=pl_params, timeout=10)
     resp.raise_for_status()
-    pl_data = resp.json()
+    pl_data = _json_loads(resp.content)
 
     video_ids = []
     for item in pl_data.get("items", []):
@@ -351,7 +922,27 @@ def fetch_latest_video_ids_for_channel_via_playlist(api_key, channel_id, max_res
     return video_ids
 
 
-def fetch_video_ids_for_keyword(api_key, query, max_results=5):
+def fetch_latest_video_ids_for_channel_via_playlist(
+    api_key, channel_id, max_results=5, limiter=None
+):
+    """
+    Get latest uploads for a channel via its 'uploads' playlist.
+    Much cheaper than search.list in quota terms.
+
+    For many channels, resolve the playlists in bulk with
+    fetch_uploads_playlist_ids and call fetch_latest_video_ids_for_playlist.
+    """
+    playlist_ids = fetch_uploads_playlist_ids(api_key, [channel_id], limiter=limiter)
+    uploads_playlist_id = playlist_ids.get(channel_id)
+    if uploads_playlist_id is None:
+        return []
+
+    return fetch_latest_video_ids_for_playlist(
+        api_key, uploads_playlist_id, max_results=max_results, limiter=limiter
+    )
+
+
+def fetch_video_ids_for_keyword(api_key, query, max_results=5, limiter=None):
     """
     Use YouTube search.list to discover recent videos for a keyword.
     This is quota-heavier, so use sparingly.
@@ -359,9 +950,13 @@ def fetch_video_ids_for_keyword(api_key, query, max_results=5):
     if not api_key:
         raise RuntimeError("No API key found in config.py")
 
+    if not _acquire_quota(limiter, SEARCH_LIST_COST, f"keyword '{query}'"):
+        return []
+
     base_url = "https://www.googleapis.com/youtube/v3/search"
     params = {
         "part": "snippet",
+        "fields": "items(id/videoId)",
         "q": query,
         "order": "date",
         "type": "video",
@@ -369,10 +964,11 @@ def fetch_video_ids_for_keyword(api_key, query, max_results=5):
         "key": api_key,
     }
 
+    requests = _requests()
     try:
-        resp = requests.get(base_url, params=params, timeout=10)
+        resp = _session().get(base_url, params=params, timeout=10)
         resp.raise_for_status()
-    except HTTPError as e:
+    except requests.exceptions.HTTPError as e:
         print("\n====================== API ERROR ======================")
         print(f"Error fetching videos for keyword '{query}': {e}")
         try:
@@ -384,7 +980,7 @@ def fetch_video_ids_for_keyword(api_key, query, max_results=5):
         print("=======================================================\n")
         return []
 
-    data = resp.json()
+    data = _json_loads(resp.content)
     video_ids = []
     for item in data.get("items", []):
         vid = item["id"].get("videoId")
@@ -396,19 +992,137 @@ def fetch_video_ids_for_keyword(api_key, query, max_results=5):
 
 # ---------- SNAPSHOT BUILDERS ----------
 
+def now_iso():
+    """
+    Local time as "YYYY-MM-DDTHH:MM:SS", the snapshot timestamp format.
+    """
+    return time.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def make_video_entry(channel_name, video_id, views, likes, comments, label, subscribers=0):
+    """
+    One snapshot["videos"] entry. Every snapshot builder goes through
+    here, so entries always carry the same keys in the same order.
+    """
+    return {
+        "channel_name": channel_name,
+        "video_id": video_id,
+        "views": views,
+        "likes": likes,
+        "comments": comments,
+        "subscribers": subscribers,
+        "label": label,
+    }
+
+
+def _relative_l1_change(prev_metrics, stats):
+    """
+    |change| of views + likes + comments relative to their previous total.
+    """
+    fields = ("views", "likes", "comments")
+    before = sum(prev_metrics.get(f, 0) for f in fields)
+    moved = sum(abs(stats[f] - prev_metrics.get(f, 0)) for f in fields)
+    return moved / max(before, 1)
+
+
+def _reuse_recent_snapshot(tracked_videos, snapshot_timestamp):
+    """
+    If the saved snapshot is younger than SNAPSHOT_TTL_SECONDS and covers
+    every tracked video, re-fetch a few of them; when their mean relative
+    change is below SNAPSHOT_DELTA_THRESHOLD, return a copy of the saved
+    stats (with the sampled ones refreshed) under snapshot_timestamp.
+    Returns None when a full fetch is needed.
+
+    Only tried for more than VIDEOS_PER_REQUEST videos: below that the
+    full fetch is one videos.list call, the same as the sample.
+    """
+    if len(tracked_videos) <= VIDEOS_PER_REQUEST:
+        return None
+
+    previous = load_previous_data()
+    if not previous:
+        return None
+
+    try:
+        taken_at = datetime.fromisoformat(previous.get("timestamp", "")).timestamp()
+    except (TypeError, ValueError):
+        return None
+    if time.time() - taken_at >= SNAPSHOT_TTL_SECONDS:
+        return None
+
+    prev_videos = previous.get("videos", {})
+    if any(key not in prev_videos for key in tracked_videos):
+        return None
+
+    sample_keys = random.sample(
+        list(tracked_videos), min(SNAPSHOT_SAMPLE_SIZE, len(tracked_videos))
+    )
+    sample_ids = [tracked_videos[key]["video_id"] for key in sample_keys]
+    stats_by_id = fetch_youtube_stats_for_videos(YOUTUBE_API_KEY, sample_ids)
+
+    changes = []
+    for key, vid in zip(sample_keys, sample_ids):
+        s = stats_by_id.get(vid)
+        if s is None:
+            return None
+        changes.append(_relative_l1_change(prev_videos[key], s))
+
+    if sum(changes) / len(changes) >= SNAPSHOT_DELTA_THRESHOLD:
+        return None
+
+    snapshot = {
+        "timestamp": snapshot_timestamp,
+        "videos": {}
+    }
+    for video_key in tracked_videos:
+        prev = prev_videos[video_key]
+        snapshot["videos"][video_key] = make_video_entry(
+            prev.get("channel_name"),
+            prev.get("video_id"),
+            prev.get("views", 0),
+            prev.get("likes", 0),
+            prev.get("comments", 0),
+            prev.get("label", video_key),
+            subscribers=prev.get("subscribers", 0),
+        )
+    for key, vid in zip(sample_keys, sample_ids):
+        s = stats_by_id[vid]
+        entry = snapshot["videos"][key]
+        entry["views"] = s["views"]
+        entry["likes"] = s["likes"]
+        entry["comments"] = s["comments"]
+
+    return snapshot
+
+
 def fetch_current_snapshot_from_youtube(tracked_videos):
     """
     For the fixed TRACKED_VIDEOS dict in your assignment.
     Builds a snapshot dict with current stats from YouTube.
+
+    For lists longer than one videos.list batch, polling again within
+    SNAPSHOT_TTL_SECONDS only re-fetches a small sample while the numbers
+    are quiet (see _reuse_recent_snapshot).
     """
     if not YOUTUBE_API_KEY:
         raise RuntimeError("YOUTUBE_API_KEY is not set")
 
+    snapshot_timestamp = now_iso()
+
+    if not tracked_videos:
+        return {"timestamp": snapshot_timestamp, "videos": {}}
+
+    reused = _reuse_recent_snapshot(tracked_videos, snapshot_timestamp)
+    if reused is not None:
+        return reused
+
     video_ids = [meta["video_id"] for meta in tracked_videos.values()]
-    stats_by_id = fetch_youtube_stats_for_videos(YOUTUBE_API_KEY, video_ids)
+    stats_by_id = fetch_youtube_stats_for_videos(
+        YOUTUBE_API_KEY, video_ids, use_cache=True
+    )
 
     snapshot = {
-        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "timestamp": snapshot_timestamp,
         "videos": {}
     }
 
@@ -418,17 +1132,19 @@ def fetch_current_snapshot_from_youtube(tracked_videos):
         if s is None:
             continue
 
-        label = meta.get("label", f"{s['channel_title']} – {s['title'][:50]}")
+        # Only build the fallback label for videos that don't have one
+        label = meta.get("label")
+        if label is None:
+            label = f"{s['channel_title']} – {s['title'][:50]}"
 
-        snapshot["videos"][video_key] = {
-            "channel_name": s["channel_title"] or meta["channel_name"],
-            "video_id": vid,
-            "views": s["views"],
-            "likes": s["likes"],
-            "comments": s["comments"],
-            "subscribers": 0,
-            "label": label,
-        }
+        snapshot["videos"][video_key] = make_video_entry(
+            s["channel_title"] or meta["channel_name"],
+            vid,
+            s["views"],
+            s["likes"],
+            s["comments"],
+            label,
+        )
 
     return snapshot
 
@@ -436,47 +1152,30 @@ def fetch_current_snapshot_from_youtube(tracked_videos):
 def build_snapshot_from_channels_and_keywords(
     max_per_channel=5,
     max_per_keyword=3,
+    limiter=None,
 ):
     """
     Build a snapshot using:
       - recent uploads from channels in channels.json
       - recent videos matching keyword queries in keywords.json
+
+    If a RateLimiter is given, every YouTube call draws its quota cost
+    from it first.
     """
     if not YOUTUBE_API_KEY:
         raise RuntimeError("No API key found in config.py")
 
+    snapshot_timestamp = now_iso()
+
     channels_cfg = load_channels_config()
     keywords_cfg = load_keywords_config()
 
-    all_video_ids = set()
-    video_meta_list = []
-
-    # ---- Channels via playlist ----
-    for ch in channels_cfg:
-        ch_key = ch.get("key", "channel")
-        ch_id = ch.get("channel_id")
-        ch_label = ch.get("label", ch_key)
-
-        if not ch_id:
-            continue
-
-        try:
-            ids = fetch_latest_video_ids_for_channel_via_playlist(
-                YOUTUBE_API_KEY, ch_id, max_results=max_per_channel
-            )
-        except Exception as e:
-            print(f"Error fetching channel {ch_key}: {e}")
-            continue
+    if not channels_cfg and not keywords_cfg:
+        return {"timestamp": snapshot_timestamp, "videos": {}}
 
-        for vid in ids:
-            if vid not in all_video_ids:
-                all_video_ids.add(vid)
-                video_meta_list.append({
-                    "video_id": vid,
-                    "source_type": "channel",
-                    "source_key": ch_key,
-                    "source_label": ch_label,
-                })
+    # Discovery lookups, in config order: (source meta, description, call)
+    channel_lookups = []
+    keyword_lookups = []
 
     # ---- Keywords via search.list ----
     for kw in keywords_cfg:
@@ -485,58 +1184,122 @@ def build_snapshot_from_channels_and_keywords(
         kw_label = kw.get("label", kw_key)
 
         for q in queries:
-            try:
-                ids = fetch_video_ids_for_keyword(
-                    YOUTUBE_API_KEY, q, max_results=max_per_keyword
-                )
-            except Exception as e:
-                print(f"Error fetching keyword '{q}': {e}")
-                continue
+            keyword_lookups.append((
+                {"source_type": "keyword", "source_key": kw_key, "source_label": kw_label},
+                f"keyword '{q}'",
+                partial(
+                    fetch_video_ids_for_keyword,
+                    YOUTUBE_API_KEY, q, max_results=max_per_keyword,
+                    limiter=limiter,
+                ),
+            ))
+
+    channel_ids = [ch["channel_id"] for ch in channels_cfg if ch.get("channel_id")]
+
+    # Run the lookups concurrently, but consume results in config order
+    # (channels, then keywords) so a video found by several sources is
+    # still credited to the first one.
+    # video_id -> source meta, in discovery order (dicts keep insertion order)
+    video_meta_by_id = {}
+    # videos.list batches are sent as soon as VIDEOS_PER_REQUEST new IDs
+    # have been found, so stats fetching overlaps the remaining discovery
+    pending_ids = []
+    stats_futures = []
+    stats_by_id = {}
 
-            for vid in ids:
-                if vid not in all_video_ids:
-                    all_video_ids.add(vid)
-                    video_meta_list.append({
-                        "video_id": vid,
-                        "source_type": "keyword",
-                        "source_key": kw_key,
-                        "source_label": kw_label,
-                    })
+    fetch_stats = partial(_fetch_stats_batch, YOUTUBE_API_KEY, limiter=limiter)
+
+    workers = min(MAX_CONCURRENT_REQUESTS, len(channel_ids) + len(keyword_lookups))
+    if workers:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            # Searches don't depend on anything, start them first
+            keyword_futures = [ex.submit(call) for _, _, call in keyword_lookups]
+
+            # ---- Channels via playlist ----
+            # Resolve every uploads playlist (one channels.list call per 50
+            # uncached channels) while the searches are in flight; only the
+            # playlistItems calls run per channel.
+            playlist_ids = {}
+            if channel_ids:
+                try:
+                    playlist_ids = fetch_uploads_playlist_ids(
+                        YOUTUBE_API_KEY, channel_ids, limiter=limiter
+                    )
+                except Exception as e:
+                    print(f"Error resolving channel playlists: {e}")
+
+            for ch in channels_cfg:
+                ch_key = ch.get("key", "channel")
+                ch_id = ch.get("channel_id")
+                ch_label = ch.get("label", ch_key)
+
+                if not ch_id or ch_id not in playlist_ids:
+                    continue
+
+                channel_lookups.append((
+                    {"source_type": "channel", "source_key": ch_key, "source_label": ch_label},
+                    f"channel {ch_key}",
+                    partial(
+                        fetch_latest_video_ids_for_playlist,
+                        YOUTUBE_API_KEY, playlist_ids[ch_id], max_results=max_per_channel,
+                        limiter=limiter,
+                    ),
+                ))
+
+            channel_futures = [ex.submit(call) for _, _, call in channel_lookups]
+
+            lookups = channel_lookups + keyword_lookups
+            futures = channel_futures + keyword_futures
+            for (source, what, _), future in zip(lookups, futures):
+                try:
+                    ids = future.result()
+                except Exception as e:
+                    print(f"Error fetching {what}: {e}")
+                    continue
+
+                for vid in ids:
+                    if vid not in video_meta_by_id:
+                        video_meta_by_id[vid] = source
+                        pending_ids.append(vid)
+
+                while len(pending_ids) >= VIDEOS_PER_REQUEST:
+                    batch, pending_ids = (
+                        pending_ids[:VIDEOS_PER_REQUEST],
+                        pending_ids[VIDEOS_PER_REQUEST:],
+                    )
+                    stats_futures.append(ex.submit(fetch_stats, ",".join(batch)))
+
+            # Whatever is left after discovery goes out as the last batch
+            if pending_ids:
+                stats_futures.append(ex.submit(fetch_stats, ",".join(pending_ids)))
+
+            for future in stats_futures:
+                batch_stats, _, _ = future.result()
+                stats_by_id.update(batch_stats)
 
     # No videos? Return empty snapshot
-    snapshot = {
-        "timestamp": datetime.now().isoformat(timespec="seconds"),
-        "videos": {}
-    }
-
-    if not all_video_ids:
-        return snapshot
-
-    # Fetch stats for all unique videos
-    all_video_ids_list = list(all_video_ids)
-    stats_by_id = fetch_youtube_stats_for_videos(
-        YOUTUBE_API_KEY,
-        all_video_ids_list,
-    )
-
-    for meta in video_meta_list:
-        vid = meta["video_id"]
-        stats = stats_by_id.get(vid)
-        if not stats:
-            continue
-
-        source_key = meta["source_key"]
-        video_key = f"{meta['source_type']}_{source_key}_{vid}"
-        label = f"{meta['source_label']} – {stats['title'][:50]}"
-
-        snapshot["videos"][video_key] = {
-            "channel_name": stats["channel_title"],
-            "video_id": vid,
-            "views": stats["views"],
-            "likes": stats["likes"],
-            "comments": stats["comments"],
-            "subscribers": 0,
-            "label": label,
-        }
+    if not video_meta_by_id:
+        return {"timestamp": snapshot_timestamp, "videos": {}}
+
+    # Join discovered videos with their stats in one pass, then build the
+    # entries from the rows
+    rows = [
+        (vid, meta, st)
+        for vid, meta in video_meta_by_id.items()
+        if (st := stats_by_id.get(vid))
+    ]
 
-    return snapshot
+    return {
+        "timestamp": snapshot_timestamp,
+        "videos": {
+            f"{meta['source_type']}_{meta['source_key']}_{vid}": make_video_entry(
+                st["channel_title"],
+                vid,
+                st["views"],
+                st["likes"],
+                st["comments"],
+                f"{meta['source_label']} – {st['title'][:50]}",
+            )
+            for vid, meta, st in rows
+        },
+    }
@@ -1,9 +1,10 @@
 # nim_web.py
 import os
-import json
-from datetime import datetime, timedelta
+import threading
+import time
+from datetime import datetime, timezone
 
-from flask import Flask, render_template, request, jsonify, abort
+from flask import Flask, render_template, request, jsonify, abort, make_response
 
 from nim_core import (
     load_previous_data,
@@ -11,29 +12,31 @@ from nim_core import (
     build_snapshot_from_channels_and_keywords,
     apply_deltas_to_snapshot,
     get_top_videos_by_metric,
+    get_last_option5_run,
+    set_last_option5_run,
+    build_option5_limiter,
+    file_stamp,
+    DATA_FILE_PATH,
+    OPTION5_MIN_INTERVAL,
 )
 
 app = Flask(__name__)
 
-LAST_RUN_FILE = "last_option5_run.json"
 REFRESH_TOKEN = os.getenv("REFRESH_TOKEN", "")
 
+# ?mode= value -> snapshot field to rank by (anything else ranks by pct)
+MODE_METRICS = {
+    "pct": "views_delta_pct",
+    "delta": "views_delta",
+    "views": "views",
+}
 
-def get_last_option5_run():
-    if not os.path.exists(LAST_RUN_FILE):
-        return None
-    try:
-        with open(LAST_RUN_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return datetime.fromisoformat(data.get("last_run"))
-    except Exception:
-        return None
+# Rendered dashboard pages, (snapshot file stamp, mode) -> HTML
+_PAGE_CACHE = {}
+_PAGE_CACHE_LOCK = threading.Lock()
 
-
-def set_last_option5_run():
-    now = datetime.now().isoformat(timespec="seconds")
-    with open(LAST_RUN_FILE, "w", encoding="utf-8") as f:
-        json.dump({"last_run": now}, f, indent=2)
+# How long browsers / proxies may reuse a dashboard page
+PAGE_MAX_AGE = 60
 
 
 @app.route("/")
@@ -41,21 +44,53 @@ def index():
     """
     Main dashboard view.
     Query param: mode = pct | delta | views
+
+    The page only changes when a new snapshot is saved, so each mode is
+    rendered once per snapshot and then served from _PAGE_CACHE.
     """
-    snapshot = load_previous_data()
     mode = request.args.get("mode", "pct")
+    cache_key = (file_stamp(DATA_FILE_PATH), mode)
+
+    with _PAGE_CACHE_LOCK:
+        html = _PAGE_CACHE.get(cache_key)
+
+    if html is None:
+        html = render_dashboard(mode)
+        if mode in MODE_METRICS:  # don't let arbitrary ?mode= values pile up
+            with _PAGE_CACHE_LOCK:
+                # Pages for older snapshots will never be asked for again
+                if any(key[0] != cache_key[0] for key in _PAGE_CACHE):
+                    _PAGE_CACHE.clear()
+                _PAGE_CACHE[cache_key] = html
+
+    resp = make_response(html)
+    resp.headers["Cache-Control"] = f"public, max-age={PAGE_MAX_AGE}"
+
+    # Let repeat viewers revalidate with If-None-Match / If-Modified-Since
+    # and get a body-less 304 while the snapshot is unchanged. Only known
+    # modes get validators, built from our own metric name: the raw
+    # ?mode= value never goes into a header.
+    stamp = cache_key[0]
+    if stamp is not None and mode in MODE_METRICS:
+        mtime_ns, size = stamp
+        resp.set_etag(f"{mtime_ns}-{size}-{MODE_METRICS[mode]}", weak=True)
+        resp.last_modified = datetime.fromtimestamp(mtime_ns / 1e9, tz=timezone.utc)
+        resp.make_conditional(request)
+
+    return resp
+
+
+def render_dashboard(mode):
+    """
+    Render dashboard.html for the saved snapshot, ranked for mode.
+    """
+    snapshot = load_previous_data()
 
     if snapshot is None or not snapshot.get("videos"):
         top_list = []
         last_updated = None
     else:
-        if mode == "views":
-            metric = "views"
-        elif mode == "delta":
-            metric = "views_delta"
-        else:
-            metric = "views_delta_pct"
-
+        metric = MODE_METRICS.get(mode, "views_delta_pct")
         top_list = get_top_videos_by_metric(snapshot, metric=metric, top_n=16)
         last_updated = snapshot.get("timestamp")
 
@@ -82,20 +117,20 @@ def refresh_snapshot(token):
 
     # 1 minute guard
     last_run = get_last_option5_run()
-    if last_run is not None:
-        elapsed = datetime.now() - last_run
-        if elapsed < timedelta(minutes=1):
-            return jsonify({
-                "status": "skipped_recent",
-                "message": "Already refreshed within last 1 minute.",
-                "last_run": last_run.isoformat(timespec="seconds"),
-            })
+    if last_run is not None and time.time() - last_run < OPTION5_MIN_INTERVAL:
+        return jsonify({
+            "status": "skipped_recent",
+            "message": "Already refreshed within last 1 minute.",
+            "last_run": datetime.fromtimestamp(last_run).isoformat(timespec="seconds"),
+        })
 
     # Build snapshot
     prev = load_previous_data()
+    limiter = build_option5_limiter()
     current = build_snapshot_from_channels_and_keywords(
         max_per_channel=5,
         max_per_keyword=3,
+        limiter=limiter,
     )
 
     if not current.get("videos"):
@@ -106,7 +141,7 @@ def refresh_snapshot(token):
 
     current = apply_deltas_to_snapshot(prev, current)
     save_current_data(current)
-    set_last_option5_run()
+    set_last_option5_run(quota_remaining=limiter.tokens)
 
     return jsonify({
         "status": "ok",
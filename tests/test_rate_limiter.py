@@ -0,0 +1,45 @@
+import threading
+import time
+import unittest
+
+from nim_core import RateLimiter
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_takes_tokens_without_waiting(self):
+        limiter = RateLimiter(rate_per_sec=1, burst=10, tokens=3)
+        self.assertTrue(limiter.acquire(3))
+        self.assertLess(limiter.tokens, 1)
+
+    def test_gives_up_when_wait_exceeds_max_wait(self):
+        limiter = RateLimiter(rate_per_sec=1, burst=10, tokens=0, max_wait=0.5)
+        started = time.monotonic()
+        self.assertFalse(limiter.acquire(1))
+        self.assertLess(time.monotonic() - started, 0.1)
+
+    def test_max_wait_bounds_the_whole_call_under_contention(self):
+        # 8 threads on an empty bucket refilling 2 tokens/s: only about
+        # max_wait * rate of them can succeed, and none may wait much
+        # longer than max_wait in total
+        limiter = RateLimiter(rate_per_sec=2, burst=10, tokens=0, max_wait=1.0)
+        results = []
+        lock = threading.Lock()
+
+        def worker():
+            started = time.monotonic()
+            ok = limiter.acquire(1)
+            with lock:
+                results.append((ok, time.monotonic() - started))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertLessEqual(sum(ok for ok, _ in results), 3)
+        self.assertLess(max(waited for _, waited in results), 1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()